@@ -0,0 +1,139 @@
+"""
+Compares per-request decode/encode overhead of JSON, msgpack and raw
+float32 bodies on the iris and advertising endpoints.
+
+Every format is sent through a FastAPI app over ASGI. The baseline row
+("fastapi json") is the original endpoint signature, `request: RequestIris`,
+so FastAPI parses and validates the body itself. It is what JSON clients
+paid before content negotiation. Batches were not accepted then, so the
+batch baseline declares `list[RequestIris]` instead. The other rows go
+through `read_features` / `encode_response`. The model call and the
+database commit are identical for every format and are left out.
+"""
+
+import asyncio
+import json
+import time
+
+import msgpack
+import numpy as np
+from fastapi import Depends, FastAPI
+
+from encoding import (
+    MEDIA_FLOAT32,
+    MEDIA_JSON,
+    MEDIA_MSGPACK,
+    DecodedFeatures,
+    encode_response,
+    read_features,
+)
+from models import RequestAdvertising, RequestIris
+
+ITERATIONS = 5000
+BATCH_SIZE = 256
+
+SAMPLES = {
+    "iris": (RequestIris, [5.1, 3.5, 1.4, 0.2]),
+    "advertising": (RequestAdvertising, [230.1, 37.8, 69.2]),
+}
+
+# (label, route, media type, send positional rows instead of field-keyed records)
+FORMATS = [
+    ("fastapi json", "/fastapi", MEDIA_JSON, False),
+    ("json", "/negotiated", MEDIA_JSON, False),
+    ("msgpack", "/negotiated", MEDIA_MSGPACK, False),
+    ("msgpack rows", "/negotiated", MEDIA_MSGPACK, True),
+    ("float32", "/negotiated", MEDIA_FLOAT32, True),
+]
+
+
+def build_app(schema, batch):
+    """Minimal app with the original and the negotiated endpoint signatures."""
+    app = FastAPI()
+    body_type = list[schema] if batch else schema
+
+    @app.post("/fastapi")
+    def fastapi_endpoint(request: body_type):
+        if batch:
+            return {"predictions": [0.0] * len(request)}
+        return {"prediction": 0.0}
+
+    @app.post("/negotiated")
+    def negotiated_endpoint(
+        features: DecodedFeatures = Depends(read_features(schema)),
+    ):
+        return encode_response(features, np.zeros(len(features.array)))
+
+    return app
+
+
+async def call(app, path, body, media_type):
+    """Sends one request straight through the ASGI interface."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"content-type", media_type.encode())],
+        "client": ("127.0.0.1", 0),
+        "server": ("127.0.0.1", 8000),
+    }
+    status = None
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    assert status == 200, f"{path} answered {status}"
+
+
+def encode_body(media_type, positional, schema, values, batch):
+    if media_type == MEDIA_FLOAT32:
+        return np.asarray([values] * (batch or 1), dtype="<f4").tobytes()
+    record = values if positional else dict(zip(schema.model_fields, values))
+    payload = [record] * batch if batch else record
+    if positional and not batch:
+        payload = [record]
+    if media_type == MEDIA_MSGPACK:
+        return msgpack.packb(payload)
+    return json.dumps(payload).encode()
+
+
+def run(app, path, media_type, positional, schema, values, batch=0):
+    """Returns the mean per-request overhead in microseconds."""
+    body = encode_body(media_type, positional, schema, values, batch)
+    iterations = ITERATIONS // 25 if batch else ITERATIONS
+
+    async def loop():
+        await call(app, path, body, media_type)  # warm-up
+        start = time.perf_counter()
+        for _ in range(iterations):
+            await call(app, path, body, media_type)
+        return time.perf_counter() - start
+
+    elapsed = asyncio.run(loop())
+    return elapsed / iterations * 1e6
+
+
+if __name__ == "__main__":
+    for name, (schema, values) in SAMPLES.items():
+        for batch in (0, BATCH_SIZE):
+            print(f"{name} (batch={batch})" if batch else f"{name} (single)")
+            app = build_app(schema, batch)
+            baseline = None
+            for label, path, media_type, positional in FORMATS:
+                us = run(app, path, media_type, positional, schema, values, batch)
+                baseline = baseline or us
+                print(
+                    f"  {label:<14} {us:9.1f} us  ({baseline / us:5.1f}x vs fastapi json)"
+                )
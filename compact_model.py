@@ -0,0 +1,99 @@
+"""
+Compact variant of the sentiment model.
+
+The Keras model (Embedding -> GlobalMaxPool1D -> Dense(relu) -> Dense(sigmoid))
+is exported to a single .npz with the embedding trimmed to the token ids the
+tokenizer can actually emit, and weights quantized to int8 (symmetric,
+per-row/per-column scales) or float16. Inference is a plain NumPy forward
+pass, so serving it does not require loading TensorFlow for the model.
+"""
+
+import numpy as np
+
+QUANTIZATION_MODES = ("int8", "float16")
+
+
+def reachable_vocab_size(tokenizer, vocab_size):
+    """Number of embedding rows that `texts_to_sequences` can index into."""
+    largest_index = max(tokenizer.word_index.values(), default=0)
+    if tokenizer.num_words:
+        # Tokenizer drops every index >= num_words
+        largest_index = min(largest_index, tokenizer.num_words - 1)
+    return min(largest_index + 1, vocab_size)
+
+
+def _quantize_int8(weights, axis):
+    """Symmetric int8 quantization with one scale per slice along `axis`."""
+    max_abs = np.max(np.abs(weights), axis=axis, keepdims=True)
+    scale = np.where(max_abs > 0, max_abs / 127.0, 1.0).astype(np.float32)
+    quantized = np.clip(np.round(weights / scale), -127, 127).astype(np.int8)
+    return quantized, scale
+
+
+def build_compact_weights(model, tokenizer, mode="int8"):
+    """Extracts, trims and quantizes the weights of the trained Keras model."""
+    if mode not in QUANTIZATION_MODES:
+        raise ValueError(f"Unknown quantization mode: {mode}")
+
+    embedding, kernel_1, bias_1, kernel_2, bias_2 = model.get_weights()
+    embedding = embedding[: reachable_vocab_size(tokenizer, len(embedding))]
+
+    arrays = {"mode": np.array(mode), "bias_1": bias_1, "bias_2": bias_2}
+    if mode == "float16":
+        arrays.update(
+            embedding=embedding.astype(np.float16),
+            kernel_1=kernel_1.astype(np.float16),
+            kernel_2=kernel_2.astype(np.float16),
+        )
+        return arrays
+
+    # Embedding: one scale per token row; dense kernels: one per output unit
+    for name, weights, axis in (
+        ("embedding", embedding, 1),
+        ("kernel_1", kernel_1, 0),
+        ("kernel_2", kernel_2, 0),
+    ):
+        arrays[name], arrays[f"{name}_scale"] = _quantize_int8(weights, axis)
+    return arrays
+
+
+def save_compact_weights(path, arrays):
+    # Uncompressed so loading is a straight read
+    np.savez(path, **arrays)
+
+
+class CompactSentimentModel:
+    """NumPy forward pass over the compact weights, mirroring `model.predict`."""
+
+    def __init__(self, arrays):
+        self.mode = str(arrays["mode"])
+        self.embedding = arrays["embedding"]
+        # Per-row scales are applied after the gather, so the table stays int8
+        self.embedding_scale = arrays.get("embedding_scale")
+        self.kernel_1 = self._dequantize(arrays, "kernel_1")
+        self.kernel_2 = self._dequantize(arrays, "kernel_2")
+        self.bias_1 = arrays["bias_1"].astype(np.float32)
+        self.bias_2 = arrays["bias_2"].astype(np.float32)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls({name: data[name] for name in data.files})
+
+    @staticmethod
+    def _dequantize(arrays, name):
+        weights = arrays[name].astype(np.float32)
+        scale = arrays.get(f"{name}_scale")
+        return weights * scale if scale is not None else weights
+
+    def predict(self, tokenized, verbose=0):
+        # `verbose` is accepted for call compatibility with Keras models
+        tokens = np.asarray(tokenized)
+        vectors = self.embedding[tokens].astype(np.float32)
+        if self.embedding_scale is not None:
+            vectors *= self.embedding_scale[tokens]
+        # Padding id 0 takes part in the max pool, as in the Keras model
+        pooled = vectors.max(axis=1)
+        hidden = np.maximum(pooled @ self.kernel_1 + self.bias_1, 0.0)
+        logits = hidden @ self.kernel_2 + self.bias_2
+        return 1.0 / (1.0 + np.exp(-logits))
@@ -0,0 +1,180 @@
+"""
+Content negotiation for the feature-vector prediction endpoints.
+
+Besides JSON, clients may send msgpack or a raw little-endian float32
+buffer (one row per sample, columns in request-model field order). The
+response is encoded in the same format as the request.
+"""
+
+import json
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+import msgpack
+import numpy as np
+from fastapi import HTTPException, Request, Response
+from fastapi.exceptions import RequestValidationError
+from pydantic import TypeAdapter, ValidationError
+from profiling import profile_stage
+
+MEDIA_JSON = "application/json"
+MEDIA_MSGPACK = "application/msgpack"
+MEDIA_FLOAT32 = "application/x-float32"
+
+# Aliases seen in the wild for the same formats
+MEDIA_ALIASES = {
+    "application/x-msgpack": MEDIA_MSGPACK,
+    "application/vnd.msgpack": MEDIA_MSGPACK,
+    "application/octet-stream": MEDIA_FLOAT32,
+}
+
+
+@dataclass
+class DecodedFeatures:
+    """Decoded request body: a 2-D feature matrix plus the wire format used."""
+
+    media_type: str
+    array: np.ndarray
+    batch: bool
+    fields: list[str] = field(default_factory=list)
+
+    def rows(self):
+        """Returns the features as dicts keyed by request-model field name."""
+        return [dict(zip(self.fields, map(float, row))) for row in self.array]
+
+
+def _media_type(request):
+    content_type = request.headers.get("content-type", MEDIA_JSON)
+    media_type = content_type.split(";")[0].strip().lower()
+    return MEDIA_ALIASES.get(media_type, media_type)
+
+
+def _check_finite(array):
+    if not np.isfinite(array).all():
+        raise HTTPException(
+            status_code=422, detail="Feature values must be finite numbers."
+        )
+    return array
+
+
+@lru_cache
+def _adapter(schema, batch):
+    return TypeAdapter(list[schema] if batch else schema)
+
+
+def _records_to_array(schema, payload, fields):
+    """Validates JSON/msgpack records with the SQLModel schema."""
+    records = payload if isinstance(payload, list) else [payload]
+    if not records:
+        raise HTTPException(status_code=422, detail="Empty batch.")
+    if all(isinstance(record, (list, tuple)) for record in records):
+        # Positional rows skip per-record model validation
+        try:
+            array = np.asarray(records, dtype=np.float64)
+        except (TypeError, ValueError) as e:
+            raise HTTPException(status_code=422, detail=f"Invalid feature rows: {e}")
+        if array.ndim != 2 or array.shape[1] != len(fields):
+            raise HTTPException(
+                status_code=422,
+                detail=f"Each row must contain {len(fields)} values: {fields}",
+            )
+        # None decodes to NaN here, so this also rejects nulls
+        return _check_finite(array)
+
+    is_batch = isinstance(payload, list)
+    try:
+        # One validator call for the whole payload, as FastAPI does for bodies
+        validated = _adapter(schema, is_batch).validate_python(payload)
+    except ValidationError as e:
+        # Same loc shape FastAPI produces for a declared body parameter
+        errors = [
+            {**error, "loc": ("body",) + error["loc"]}
+            for error in e.errors(include_url=False)
+        ]
+        raise RequestValidationError(errors)
+    rows = [
+        [getattr(record, name) for name in fields]
+        for record in (validated if is_batch else [validated])
+    ]
+    return _check_finite(np.asarray(rows, dtype=np.float64).reshape(-1, len(fields)))
+
+
+def read_features(schema):
+    """Builds a dependency that decodes the body into a feature matrix."""
+    fields = list(schema.model_fields)
+
+    async def dependency(request: Request) -> DecodedFeatures:
+        media_type = _media_type(request)
+        body = await request.body()
+        with profile_stage("validation"):
+            return _decode(schema, fields, media_type, body)
+
+    return dependency
+
+
+def _decode(schema, fields, media_type, body):
+    if media_type == MEDIA_FLOAT32:
+        row_size = 4 * len(fields)
+        if not body or len(body) % row_size:
+            raise HTTPException(
+                status_code=422,
+                detail=f"Body must be a multiple of {row_size} bytes "
+                f"({len(fields)} float32 values per row).",
+            )
+        # Zero-copy view over the request bytes
+        array = np.frombuffer(body, dtype="<f4").reshape(-1, len(fields))
+        _check_finite(array)
+        return DecodedFeatures(media_type, array, True, fields)
+
+    try:
+        if media_type == MEDIA_MSGPACK:
+            payload = msgpack.unpackb(body)
+        elif media_type == MEDIA_JSON:
+            payload = json.loads(body)
+        else:
+            raise HTTPException(
+                status_code=415, detail=f"Unsupported media type: {media_type}"
+            )
+    except (ValueError, msgpack.UnpackException) as e:
+        raise HTTPException(status_code=400, detail=f"Malformed body: {e}")
+
+    array = _records_to_array(schema, payload, fields)
+    return DecodedFeatures(media_type, array, isinstance(payload, list), fields)
+
+
+def encode_response(features, predictions, headers=None):
+    """Encodes predictions in the same format the request was sent in."""
+    if features.media_type == MEDIA_FLOAT32:
+        values = np.asarray(predictions)
+        dtype = "<i4" if np.issubdtype(values.dtype, np.integer) else "<f4"
+        return Response(
+            values.astype(dtype).tobytes(),
+            media_type=MEDIA_FLOAT32,
+            headers=headers,
+        )
+
+    predictions = [p.item() if hasattr(p, "item") else p for p in predictions]
+    content = (
+        {"predictions": predictions}
+        if features.batch
+        else {"prediction": predictions[0]}
+    )
+    if features.media_type == MEDIA_MSGPACK:
+        return Response(
+            msgpack.packb(content), media_type=MEDIA_MSGPACK, headers=headers
+        )
+    return content
+
+
+def request_body_docs(schema):
+    """OpenAPI request body for endpoints that read the body themselves."""
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {
+                MEDIA_JSON: {"schema": schema.model_json_schema()},
+                MEDIA_MSGPACK: {"schema": schema.model_json_schema()},
+                MEDIA_FLOAT32: {"schema": {"type": "string", "format": "binary"}},
+            },
+        }
+    }
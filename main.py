@@ -1,11 +1,25 @@
 # main.py
 import joblib
 from fastapi import FastAPI
-from routers import product_review_llm, iris, advertising, tensorflow_fastapi
+from routers import (
+    product_review_llm,
+    iris,
+    advertising,
+    tensorflow_fastapi,
+    profiler,
+    shadow,
+)
 from database import create_db_and_tables
+from profiling import PROFILING_ENABLED, profile_requests
 
 # CRITICAL: Import all table models here so SQLModel metadata detects them
-from models import Advertising, Iris, ProductReviewRate, CommentPredict
+from models import (
+    Advertising,
+    Iris,
+    ProductReviewRate,
+    CommentPredict,
+    ShadowComparison,
+)
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -24,6 +38,12 @@ app.include_router(product_review_llm.router, prefix="/product-review", tags=["L
 app.include_router(iris.router, prefix="/iris", tags=["Iris"])
 app.include_router(advertising.router, prefix="/advertising", tags=["Advertising"])
 app.include_router(tensorflow_fastapi.router, prefix="/tensorflow", tags=["TensorFlow"])
+app.include_router(shadow.router, prefix="/shadow", tags=["Shadow"])
+
+# Profiling is opt-in: without it neither the middleware nor the admin routes exist
+if PROFILING_ENABLED:
+    app.middleware("http")(profile_requests)
+    app.include_router(profiler.router, prefix="/admin/profiler", tags=["Profiling"])
 
 
 @app.get("/")
@@ -140,3 +140,23 @@ class CommentPredict(SQLModel, table=True):
     sentiment: str
     client_ip: str
     created_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
+
+
+class ShadowComparison(SQLModel, table=True):
+    __tablename__ = "shadow_comparisons"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    model_name: str = Field(index=True, description="iris, advertising or sentiment")
+    input_data: str = Field(description="Mirrored input as JSON string")
+    primary_prediction: str
+    candidate_prediction: str
+    agreement: bool
+    delta: Optional[float] = Field(
+        default=None, description="Candidate minus primary, for numeric outputs"
+    )
+    primary_latency_ms: float
+    candidate_latency_ms: float
+    latency_ratio: Optional[float] = Field(
+        default=None, description="Candidate latency divided by primary latency"
+    )
+    created_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
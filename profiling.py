@@ -0,0 +1,183 @@
+"""
+Opt-in request profiling.
+
+When PROFILING_ENABLED is set, a middleware records a per-request timeline
+for a sampled fraction of requests (or any request carrying the X-Profile
+header). Code marks its stages with `profile_stage(...)`, which is a shared
+no-op context manager for requests that are not being profiled. Body
+validation done by FastAPI itself (e.g. the Comment and AnalyzedReview
+models) happens outside any stage and shows up as `unattributed_ms`.
+
+A stdlib sampling profiler can also be started on demand; it aggregates
+stacks in the collapsed format understood by flamegraph.pl and speedscope.
+"""
+
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextlib import nullcontext
+from contextvars import ContextVar
+
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+PROFILING_SAMPLE_RATE = float(os.getenv("PROFILING_SAMPLE_RATE", "0.01"))
+PROFILE_HEADER = "X-Profile"
+# Admin routes refuse every request unless this token is configured
+PROFILING_ADMIN_TOKEN = os.getenv("PROFILING_ADMIN_TOKEN")
+
+# Most recent sampled timelines, newest last
+RECENT_TIMELINES = deque(maxlen=int(os.getenv("PROFILING_MAX_TIMELINES", "200")))
+
+_current_timeline = ContextVar("current_timeline", default=None)
+_NO_STAGE = nullcontext()
+
+
+class _Stage:
+    __slots__ = ("timeline", "name", "start")
+
+    def __init__(self, timeline, name):
+        self.timeline = timeline
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        end = time.perf_counter()
+        self.timeline.stages.append(
+            {
+                "name": self.name,
+                "offset_ms": (self.start - self.timeline.start) * 1000,
+                "duration_ms": (end - self.start) * 1000,
+            }
+        )
+        return False
+
+
+class Timeline:
+    """Stage timings collected while serving a single request."""
+
+    def __init__(self, method, path):
+        self.method = method
+        self.path = path
+        self.start = time.perf_counter()
+        self.started_at = time.time()
+        self.total_ms = None
+        self.stages = []
+
+    def finish(self):
+        self.total_ms = (time.perf_counter() - self.start) * 1000
+
+    def server_timing(self):
+        """Formats the stages as a Server-Timing header value."""
+        entries = [f"{s['name']};dur={s['duration_ms']:.2f}" for s in self.stages]
+        entries.append(f"total;dur={self.total_ms:.2f}")
+        return ", ".join(entries)
+
+    def to_dict(self):
+        accounted = sum(s["duration_ms"] for s in self.stages)
+        return {
+            "method": self.method,
+            "path": self.path,
+            "started_at": self.started_at,
+            "total_ms": self.total_ms,
+            "unattributed_ms": self.total_ms - accounted,
+            "stages": self.stages,
+        }
+
+
+def profile_stage(name):
+    """Times a block as a named stage of the current request, if profiled."""
+    timeline = _current_timeline.get()
+    if timeline is None:
+        return _NO_STAGE
+    return _Stage(timeline, name)
+
+
+async def profile_requests(request, call_next):
+    """HTTP middleware recording timelines for sampled requests."""
+    if PROFILE_HEADER not in request.headers and (
+        random.random() >= PROFILING_SAMPLE_RATE
+    ):
+        return await call_next(request)
+
+    timeline = Timeline(request.method, request.url.path)
+    token = _current_timeline.set(timeline)
+    try:
+        response = await call_next(request)
+    finally:
+        _current_timeline.reset(token)
+        timeline.finish()
+        RECENT_TIMELINES.append(timeline)
+
+    response.headers["Server-Timing"] = timeline.server_timing()
+    return response
+
+
+class SamplingProfiler:
+    """Periodically samples every thread's stack from a background thread."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.stacks = Counter()
+        self.samples = 0
+        self.started_at = None
+        self.stopped_at = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, seconds, interval):
+        """Starts sampling for `seconds`; returns False if already running."""
+        with self._lock:
+            if self.running:
+                return False
+            self.stacks = Counter()
+            self.samples = 0
+            self.started_at = time.time()
+            self.stopped_at = None
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, args=(seconds, interval), daemon=True
+            )
+            self._thread.start()
+            return True
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self, seconds, interval):
+        own_id = threading.get_ident()
+        deadline = time.monotonic() + seconds
+        while not self._stop.is_set() and time.monotonic() < deadline:
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id != own_id:
+                    self.stacks[_collapse(frame)] += 1
+            self.samples += 1
+            self._stop.wait(interval)
+        self.stopped_at = time.time()
+
+    def collapsed(self):
+        """Returns the profile in collapsed-stack ("folded") text format."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.items())
+
+
+def _collapse(frame):
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        filename = os.path.basename(code.co_filename)
+        names.append(f"{code.co_name} ({filename}:{frame.f_lineno})")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+sampler = SamplingProfiler()
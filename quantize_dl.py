@@ -0,0 +1,104 @@
+import os
+import pickle
+import time
+import numpy as np
+import pandas as pd
+from tensorflow.keras.models import load_model
+from tensorflow.keras.preprocessing.sequence import pad_sequences
+from sklearn.model_selection import train_test_split
+from compact_model import (
+    QUANTIZATION_MODES,
+    CompactSentimentModel,
+    build_compact_weights,
+    save_compact_weights,
+)
+
+# Define internal project paths for portability
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(BASE_DIR, "data")
+MODEL_DIR = os.path.join(BASE_DIR, "saved_models")
+
+MODEL_PATH = os.path.join(MODEL_DIR, "tensorflow_model.h5")
+TOKENIZER_PATH = os.path.join(MODEL_DIR, "tokenizer.pkl")
+LATENCY_RUNS = 200
+maxlen = 100
+
+
+def load_test_split():
+    """Rebuilds the held-out Yelp split used by train_dl.py."""
+    filepath = os.path.join(DATA_DIR, "yelp_labelled.txt")
+    df = pd.read_csv(filepath, names=["sentence", "label"], sep="\t")
+    _, sentences_test, _, y_test = train_test_split(
+        df["sentence"].values, df["label"].values, test_size=0.25, random_state=1000
+    )
+    return sentences_test, y_test
+
+
+def measure(load, path, X_test, y_test, single):
+    """Returns size, load time, accuracy and single-comment latency."""
+    start = time.perf_counter()
+    model = load(path)
+    load_ms = (time.perf_counter() - start) * 1000
+
+    predictions = np.asarray(model.predict(X_test)).reshape(-1)
+    accuracy = float(np.mean((predictions > 0.5) == y_test))
+
+    model.predict(single)  # warm-up
+    start = time.perf_counter()
+    for _ in range(LATENCY_RUNS):
+        model.predict(single)
+    latency_ms = (time.perf_counter() - start) / LATENCY_RUNS * 1000
+
+    return {
+        "size_kb": os.path.getsize(path) / 1024,
+        "load_ms": load_ms,
+        "accuracy": accuracy,
+        "latency_ms": latency_ms,
+    }
+
+
+class _KerasModel:
+    """Wraps the Keras model so `predict` matches the compact model's call."""
+
+    def __init__(self, path):
+        self.model = load_model(path, compile=False)
+
+    def predict(self, tokenized):
+        return self.model.predict(tokenized, verbose=0)
+
+
+# Main Execution Flow
+with open(TOKENIZER_PATH, "rb") as f:
+    tokenizer = pickle.load(f)
+
+sentences_test, y_test = load_test_split()
+X_test = pad_sequences(
+    tokenizer.texts_to_sequences(sentences_test), padding="post", maxlen=maxlen
+)
+single = X_test[:1]
+
+keras_model = load_model(MODEL_PATH, compile=False)
+report = {"keras_h5": measure(_KerasModel, MODEL_PATH, X_test, y_test, single)}
+
+for mode in QUANTIZATION_MODES:
+    compact_path = os.path.join(MODEL_DIR, f"tensorflow_model_{mode}.npz")
+    save_compact_weights(
+        compact_path, build_compact_weights(keras_model, tokenizer, mode)
+    )
+    print(f"Compact {mode} model saved to {compact_path}")
+    report[mode] = measure(
+        CompactSentimentModel.load, compact_path, X_test, y_test, single
+    )
+
+baseline = report["keras_h5"]
+print(f"\nHeld-out split: {len(y_test)} Yelp sentences")
+print(
+    f"{'variant':<10} {'size KB':>9} {'load ms':>9} {'latency ms':>11} "
+    f"{'accuracy':>9} {'delta':>8}"
+)
+for name, row in report.items():
+    print(
+        f"{name:<10} {row['size_kb']:9.1f} {row['load_ms']:9.1f} "
+        f"{row['latency_ms']:11.3f} {row['accuracy']:9.4f} "
+        f"{row['accuracy'] - baseline['accuracy']:+8.4f}"
+    )
@@ -3,8 +3,12 @@ from fastapi import Depends, Request
 from sqlmodel import Session
 from models import Advertising, RequestAdvertising
 from database import get_db
+from profiling import profile_stage
+from encoding import DecodedFeatures, encode_response, read_features, request_body_docs
 import joblib
 import os
+import shadow
+import time
 
 router = APIRouter()
 
@@ -12,35 +16,56 @@ router = APIRouter()
 MODEL_PATH = "saved_models/advertising_model.pkl"
 advertising_estimator_loaded = joblib.load(MODEL_PATH)
 
+# Optional retrained model evaluated in shadow mode
+CANDIDATE_MODEL_PATH = os.getenv("ADVERTISING_CANDIDATE_MODEL_PATH")
 
-def make_advertising_prediction(estimator, input_data):
-    """Makes prediction using the loaded Scikit-learn regressor."""
-    data = [[input_data["tv"], input_data["radio"], input_data["newspaper"]]]
-    prediction = estimator.predict(data)
-    return float(prediction[0])
 
+def make_advertising_prediction(estimator, features):
+    """Predicts sales for a 2-D feature matrix with the Scikit-learn regressor."""
+    return estimator.predict(features)
 
-def insert_advertising(request, prediction, client_ip, db):
-    """Logs the prediction results to PostgreSQL."""
-    new_advertising = Advertising(
-        tv=request["tv"],
-        radio=request["radio"],
-        newspaper=request["newspaper"],
-        prediction=prediction,
-        client_ip=client_ip,
+
+if CANDIDATE_MODEL_PATH:
+    advertising_candidate_loaded = joblib.load(CANDIDATE_MODEL_PATH)
+    shadow.register_candidate(
+        "advertising",
+        lambda features: make_advertising_prediction(
+            advertising_candidate_loaded, features
+        ),
+        shadow.compare_regression,
     )
-    db.add(new_advertising)
-    db.commit()
-    db.refresh(new_advertising)
-    return new_advertising
 
 
-@router.post("/prediction/advertising")
+def insert_advertising(requests, predictions, client_ip, db):
+    """Logs a batch of prediction results to PostgreSQL."""
+    db.add_all(
+        Advertising(
+            tv=request["tv"],
+            radio=request["radio"],
+            newspaper=request["newspaper"],
+            prediction=float(prediction),
+            client_ip=client_ip,
+        )
+        for request, prediction in zip(requests, predictions)
+    )
+    with profile_stage("db_commit"):
+        db.commit()
+
+
+@router.post(
+    "/prediction/advertising", openapi_extra=request_body_docs(RequestAdvertising)
+)
 def predict_advertising(
-    request: RequestAdvertising, fastapi_req: Request, db: Session = Depends(get_db)
+    fastapi_req: Request,
+    features: DecodedFeatures = Depends(read_features(RequestAdvertising)),
+    db: Session = Depends(get_db),
 ):
-    prediction = make_advertising_prediction(
-        advertising_estimator_loaded, request.model_dump()
-    )
-    insert_advertising(request.model_dump(), prediction, fastapi_req.client.host, db)
-    return {"prediction": prediction}
+    with profile_stage("model"):
+        start = time.perf_counter()
+        predictions = make_advertising_prediction(
+            advertising_estimator_loaded, features.array
+        )
+        model_ms = (time.perf_counter() - start) * 1000
+    shadow.mirror("advertising", features.array, predictions, model_ms)
+    insert_advertising(features.rows(), predictions, fastapi_req.client.host, db)
+    return encode_response(features, predictions)
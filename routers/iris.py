@@ -3,8 +3,18 @@ from models import RequestIris, Iris
 from fastapi import Depends, Request
 from sqlmodel import Session
 from database import get_db
+from profiling import profile_stage
+from encoding import (
+    MEDIA_FLOAT32,
+    DecodedFeatures,
+    encode_response,
+    read_features,
+    request_body_docs,
+)
 import joblib
 import os
+import shadow
+import time
 
 router = APIRouter()
 
@@ -12,44 +22,62 @@ router = APIRouter()
 iris_classifier_loaded = joblib.load("saved_models/iris_model.pkl")
 iris_encoder_loaded = joblib.load("saved_models/label_encoder.pkl")
 
+# Optional retrained model evaluated in shadow mode (shares the label encoder)
+CANDIDATE_MODEL_PATH = os.getenv("IRIS_CANDIDATE_MODEL_PATH")
 
-def make_iris_prediction(estimator, encoder, input_data):
-    """Predicts iris species and decodes the label."""
-    data = [
-        [
-            input_data["SepalLengthCm"],
-            input_data["SepalWidthCm"],
-            input_data["PetalLengthCm"],
-            input_data["PetalWidthCm"],
-        ]
-    ]
-    prediction_raw = estimator.predict(data)
-    prediction_real = encoder.inverse_transform(prediction_raw)
-    return prediction_real[0]
-
-
-def insert_iris(request, prediction, client_ip, db):
-    """Logs the iris classification result to the database."""
-    new_iris = Iris(
-        sepal_length=request["SepalLengthCm"],
-        sepal_width=request["SepalWidthCm"],
-        petal_length=request["PetalLengthCm"],
-        petal_width=request["PetalWidthCm"],
-        prediction=prediction,
-        client_ip=client_ip,
+
+def make_iris_prediction(estimator, encoder, features):
+    """Predicts iris species for a 2-D feature matrix and decodes the labels."""
+    prediction_raw = estimator.predict(features)
+    return encoder.inverse_transform(prediction_raw)
+
+
+if CANDIDATE_MODEL_PATH:
+    iris_candidate_loaded = joblib.load(CANDIDATE_MODEL_PATH)
+    shadow.register_candidate(
+        "iris",
+        lambda features: make_iris_prediction(
+            iris_candidate_loaded, iris_encoder_loaded, features
+        ),
+        shadow.compare_labels,
+    )
+
+
+def insert_iris(requests, predictions, client_ip, db):
+    """Logs a batch of iris classification results to the database."""
+    db.add_all(
+        Iris(
+            sepal_length=request["SepalLengthCm"],
+            sepal_width=request["SepalWidthCm"],
+            petal_length=request["PetalLengthCm"],
+            petal_width=request["PetalWidthCm"],
+            prediction=str(prediction),
+            client_ip=client_ip,
+        )
+        for request, prediction in zip(requests, predictions)
     )
-    db.add(new_iris)
-    db.commit()
-    db.refresh(new_iris)
-    return new_iris
+    with profile_stage("db_commit"):
+        db.commit()
 
 
-@router.post("/prediction/iris")
+@router.post("/prediction/iris", openapi_extra=request_body_docs(RequestIris))
 def predict_iris(
-    request: RequestIris, fastapi_req: Request, db: Session = Depends(get_db)
+    fastapi_req: Request,
+    features: DecodedFeatures = Depends(read_features(RequestIris)),
+    db: Session = Depends(get_db),
 ):
-    prediction = make_iris_prediction(
-        iris_classifier_loaded, iris_encoder_loaded, request.model_dump()
-    )
-    insert_iris(request.model_dump(), prediction, fastapi_req.client.host, db)
-    return {"prediction": prediction}
+    with profile_stage("model"):
+        start = time.perf_counter()
+        labels = make_iris_prediction(
+            iris_classifier_loaded, iris_encoder_loaded, features.array
+        )
+        model_ms = (time.perf_counter() - start) * 1000
+    shadow.mirror("iris", features.array, labels, model_ms)
+    insert_iris(features.rows(), labels, fastapi_req.client.host, db)
+
+    if features.media_type == MEDIA_FLOAT32:
+        # Raw buffers carry class indices; the label order travels in a header
+        classes = ",".join(iris_encoder_loaded.classes_)
+        codes = iris_encoder_loaded.transform(labels)
+        return encode_response(features, codes, headers={"X-Class-Labels": classes})
+    return encode_response(features, labels)
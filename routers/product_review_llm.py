@@ -5,6 +5,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlmodel import Session
 from langchain_google_genai import ChatGoogleGenerativeAI
 from database import get_db
+from profiling import profile_stage
 from models import ProductReview, AnalyzedReview, ProductReviewRate
 
 router = APIRouter()
@@ -18,7 +19,8 @@ llm = ChatGoogleGenerativeAI(
 @router.post("/llm/chat")
 async def chat(request: AnalyzedReview, db: Session = Depends(get_db)):
     try:
-        analysis = llm.invoke(request.review)
+        with profile_stage("model"):
+            analysis = llm.invoke(request.review)
 
         new_review = ProductReviewRate(
             user_info=request.user,
@@ -31,7 +33,8 @@ async def chat(request: AnalyzedReview, db: Session = Depends(get_db)):
         )
 
         db.add(new_review)
-        db.commit()  # Save to DB
+        with profile_stage("db_commit"):
+            db.commit()  # Save to DB
         db.refresh(new_review)
 
         return {"status": "success", "analysis": analysis}
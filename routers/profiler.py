@@ -0,0 +1,54 @@
+import secrets
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+from profiling import PROFILING_ADMIN_TOKEN, RECENT_TIMELINES, sampler
+
+
+def require_admin_token(x_admin_token: str = Header(default="")):
+    """Rejects requests that do not carry PROFILING_ADMIN_TOKEN."""
+    if not PROFILING_ADMIN_TOKEN:
+        raise HTTPException(
+            status_code=403, detail="PROFILING_ADMIN_TOKEN is not configured."
+        )
+    if not secrets.compare_digest(
+        x_admin_token.encode(), PROFILING_ADMIN_TOKEN.encode()
+    ):
+        raise HTTPException(status_code=401, detail="Invalid admin token.")
+
+
+router = APIRouter(dependencies=[Depends(require_admin_token)])
+
+
+@router.post("/start")
+def start_profiler(
+    seconds: float = Query(30, gt=0, le=120),
+    interval_ms: float = Query(10, ge=5, le=1000),
+):
+    """Starts the sampling profiler for the given number of seconds."""
+    if not sampler.start(seconds, interval_ms / 1000):
+        raise HTTPException(status_code=409, detail="Profiler is already running.")
+    return {"status": "started", "seconds": seconds, "interval_ms": interval_ms}
+
+
+@router.post("/stop")
+def stop_profiler():
+    sampler.stop()
+    return {"status": "stopped", "samples": sampler.samples}
+
+
+@router.get("/profile", response_class=PlainTextResponse)
+def download_profile():
+    """Downloads the last profile as collapsed stacks (flamegraph.pl / speedscope)."""
+    if sampler.running:
+        raise HTTPException(status_code=409, detail="Profiler is still running.")
+    return PlainTextResponse(
+        sampler.collapsed(),
+        headers={"Content-Disposition": 'attachment; filename="profile.folded"'},
+    )
+
+
+@router.get("/timelines")
+def recent_timelines(limit: int = Query(50, ge=1, le=1000)):
+    """Returns the most recent sampled request timelines, newest first."""
+    timelines = list(RECENT_TIMELINES)[-limit:]
+    return [timeline.to_dict() for timeline in reversed(timelines)]
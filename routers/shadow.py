@@ -0,0 +1,65 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy import case, func
+from sqlmodel import Session, select
+from database import get_db
+from models import ShadowComparison
+import shadow
+
+router = APIRouter()
+
+
+@router.get("/summary")
+def shadow_summary(db: Session = Depends(get_db)):
+    """Aggregates shadow comparisons per model.
+
+    `dropped_samples` counts queue-full drops on the pod serving this request.
+    """
+    statement = select(
+        ShadowComparison.model_name,
+        func.count(ShadowComparison.id),
+        func.avg(case((ShadowComparison.agreement, 1.0), else_=0.0)),
+        func.avg(func.abs(ShadowComparison.delta)),
+        func.avg(ShadowComparison.primary_latency_ms),
+        func.avg(ShadowComparison.candidate_latency_ms),
+        func.avg(ShadowComparison.latency_ratio),
+    ).group_by(ShadowComparison.model_name)
+
+    dropped = shadow.dropped_samples()
+    summary = [
+        {
+            "model": model,
+            "samples": samples,
+            "agreement_rate": agreement_rate,
+            "mean_abs_delta": mean_abs_delta,
+            "mean_primary_latency_ms": primary_ms,
+            "mean_candidate_latency_ms": candidate_ms,
+            "mean_latency_ratio": latency_ratio,
+            "dropped_samples": dropped.get(model, 0),
+        }
+        for (
+            model,
+            samples,
+            agreement_rate,
+            mean_abs_delta,
+            primary_ms,
+            candidate_ms,
+            latency_ratio,
+        ) in db.exec(statement).all()
+    ]
+    # Models whose every sample was dropped have no comparison rows
+    reported = {row["model"] for row in summary}
+    for model, count in dropped.items():
+        if model not in reported:
+            summary.append(
+                {
+                    "model": model,
+                    "samples": 0,
+                    "agreement_rate": None,
+                    "mean_abs_delta": None,
+                    "mean_primary_latency_ms": None,
+                    "mean_candidate_latency_ms": None,
+                    "mean_latency_ratio": None,
+                    "dropped_samples": count,
+                }
+            )
+    return summary
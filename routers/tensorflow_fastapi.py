@@ -1,16 +1,39 @@
 import os
 import pickle
+import time
 from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlmodel import Session
 from tensorflow.keras.models import load_model
+from tensorflow.keras.preprocessing.sequence import pad_sequences
 from database import get_db
+from compact_model import QUANTIZATION_MODES, CompactSentimentModel
+from profiling import profile_stage
 from models import Comment, CommentPredict
+import shadow
 
 router = APIRouter()
 
 MODEL_PATH = "saved_models/tensorflow_model.h5"
 TOKENIZER_PATH = "saved_models/tokenizer.pkl"
+# "keras" serves the .h5 model; "int8"/"float16" serve the compact variant
+SENTIMENT_BACKEND = os.getenv("SENTIMENT_BACKEND", "keras").lower()
+if SENTIMENT_BACKEND not in ("keras",) + QUANTIZATION_MODES:
+    raise ValueError(
+        f"Unknown SENTIMENT_BACKEND '{SENTIMENT_BACKEND}', "
+        f"expected one of: keras, {', '.join(QUANTIZATION_MODES)}"
+    )
+COMPACT_MODEL_PATH = f"saved_models/tensorflow_model_{SENTIMENT_BACKEND}.npz"
+# Reported once here; get_resources() keeps retrying quietly per request
+if SENTIMENT_BACKEND in QUANTIZATION_MODES and not os.path.exists(COMPACT_MODEL_PATH):
+    print(f"Compact model not found at {COMPACT_MODEL_PATH}")
+# Optional retrained model (.h5 or compact .npz) evaluated in shadow mode.
+# train_dl.py refits the tokenizer on every run, so a candidate must be paired
+# with its own tokenizer; the primary one is only correct for the same fit.
+CANDIDATE_MODEL_PATH = os.getenv("SENTIMENT_CANDIDATE_MODEL_PATH")
+CANDIDATE_TOKENIZER_PATH = os.getenv(
+    "SENTIMENT_CANDIDATE_TOKENIZER_PATH", TOKENIZER_PATH
+)
 
 _model = None
 _tokenizer = None
@@ -18,7 +41,14 @@ _tokenizer = None
 
 def get_resources():
     global _model, _tokenizer
-    if _model is None:
+    if _model is None and SENTIMENT_BACKEND in QUANTIZATION_MODES:
+        if os.path.exists(COMPACT_MODEL_PATH):
+            try:
+                _model = CompactSentimentModel.load(COMPACT_MODEL_PATH)
+                print(f"Compact {SENTIMENT_BACKEND} sentiment model loaded.")
+            except Exception as e:
+                print(f"Compact Load Failure: {e}")
+    elif _model is None:
         if os.path.exists(MODEL_PATH):
             try:
                 # compile=False prevents the quantization_config error
@@ -33,6 +63,43 @@ def get_resources():
     return _model, _tokenizer
 
 
+def tokenize_comments(tokenizer, comments):
+    """Converts raw comments into padded token-id sequences."""
+    sequences = tokenizer.texts_to_sequences(comments)
+    return pad_sequences(sequences, padding="post", maxlen=100)
+
+
+def make_sentiment_prediction(model, tokenized):
+    """Returns the positive-class probability for each padded sequence."""
+    return [float(score[0]) for score in model.predict(tokenized, verbose=0)]
+
+
+def load_sentiment_model(path):
+    """Loads a Keras .h5 model or a compact .npz variant."""
+    if path.endswith(".npz"):
+        return CompactSentimentModel.load(path)
+    return load_model(path, compile=False)
+
+
+if CANDIDATE_MODEL_PATH:
+    sentiment_candidate_loaded = load_sentiment_model(CANDIDATE_MODEL_PATH)
+    with open(CANDIDATE_TOKENIZER_PATH, "rb") as f:
+        sentiment_candidate_tokenizer = pickle.load(f)
+    # Warm up so the first shadow sample does not time Keras graph tracing
+    make_sentiment_prediction(
+        sentiment_candidate_loaded,
+        tokenize_comments(sentiment_candidate_tokenizer, [""]),
+    )
+    shadow.register_candidate(
+        "sentiment",
+        lambda comments: make_sentiment_prediction(
+            sentiment_candidate_loaded,
+            tokenize_comments(sentiment_candidate_tokenizer, comments),
+        ),
+        shadow.compare_probabilities,
+    )
+
+
 @router.post("/prediction/comment")
 async def predict_sentiment(
     request: Comment, fastapi_req: Request, db: Session = Depends(get_db)
@@ -42,15 +109,23 @@ async def predict_sentiment(
         raise HTTPException(status_code=503, detail="Model resources not ready.")
 
     try:
-        from tensorflow.keras.preprocessing.sequence import pad_sequences
-
-        sequences = tokenizer.texts_to_sequences([request.comment])
-        tokenized = pad_sequences(sequences, padding="post", maxlen=100)
+        # Tokenization is timed too, since the shadow candidate tokenizes itself
+        start = time.perf_counter()
+        with profile_stage("tokenization"):
+            tokenized = tokenize_comments(tokenizer, [request.comment])
 
         # Inference
-        prediction = model.predict(tokenized)
-        # Check first element of the first prediction result
-        label = "positive" if float(prediction[0][0]) > 0.5 else "negative"
+        with profile_stage("model"):
+            scores = make_sentiment_prediction(model, tokenized)
+        model_ms = (time.perf_counter() - start) * 1000
+        shadow.mirror(
+            "sentiment",
+            [request.comment],
+            scores,
+            model_ms,
+            logged_inputs=[request.comment],
+        )
+        label = "positive" if scores[0] > 0.5 else "negative"
 
         # Database Commit
         new_record = CommentPredict(
@@ -60,7 +135,8 @@ async def predict_sentiment(
             created_at=datetime.utcnow(),
         )
         db.add(new_record)
-        db.commit()  # Save to DB
+        with profile_stage("db_commit"):
+            db.commit()  # Save to DB
         db.refresh(new_record)
 
         return {"sentiment": label}
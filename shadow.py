@@ -0,0 +1,130 @@
+"""
+Shadow evaluation of candidate models.
+
+Routers keep serving the primary model and hand a sample of their requests
+to `mirror(...)`, which only enqueues them. A single background worker runs
+the registered candidate, compares its output with the primary prediction
+and stores one ShadowComparison row per sample. When the queue is full,
+samples are dropped (and counted per model) rather than slowing down the
+request. Models without a registered candidate are never sampled.
+"""
+
+import json
+import os
+import queue
+import random
+import threading
+import time
+from collections import Counter
+from sqlmodel import Session
+from database import engine
+from models import ShadowComparison
+
+SHADOW_SAMPLE_RATE = float(os.getenv("SHADOW_SAMPLE_RATE", "0.1"))
+SHADOW_QUEUE_SIZE = int(os.getenv("SHADOW_QUEUE_SIZE", "1000"))
+# Relative difference under which two regression outputs count as agreeing
+SHADOW_REGRESSION_TOLERANCE = float(os.getenv("SHADOW_REGRESSION_TOLERANCE", "0.05"))
+
+_candidates = {}
+_queue = queue.Queue(maxsize=SHADOW_QUEUE_SIZE)
+_worker = None
+_worker_lock = threading.Lock()
+# Samples dropped on a full queue, per model, since this process started.
+# Sync endpoints call mirror() from threadpool threads, hence the lock.
+_dropped_samples = Counter()
+_dropped_lock = threading.Lock()
+
+
+def compare_labels(primary, candidate):
+    return primary == candidate, None
+
+
+def compare_regression(primary, candidate):
+    delta = float(candidate) - float(primary)
+    scale = max(abs(float(primary)), 1e-9)
+    return abs(delta) / scale <= SHADOW_REGRESSION_TOLERANCE, delta
+
+
+def compare_probabilities(primary, candidate):
+    delta = float(candidate) - float(primary)
+    return (float(primary) > 0.5) == (float(candidate) > 0.5), delta
+
+
+def register_candidate(name, predict, compare):
+    """Registers `predict(inputs) -> predictions` as the candidate for `name`."""
+    _candidates[name] = (predict, compare)
+
+
+def mirror(name, inputs, primary_predictions, primary_ms, logged_inputs=None):
+    """Queues a sampled request for off-path comparison with the candidate."""
+    if name not in _candidates or random.random() >= SHADOW_SAMPLE_RATE:
+        return
+    _ensure_worker()
+    # Arrays are queued as-is; JSON-ready rows are built on the worker
+    try:
+        _queue.put_nowait(
+            (name, inputs, primary_predictions, primary_ms, logged_inputs)
+        )
+    except queue.Full:
+        with _dropped_lock:
+            _dropped_samples[name] += 1
+
+
+def dropped_samples():
+    """Returns a snapshot of queue-full drops per model for this process."""
+    with _dropped_lock:
+        return dict(_dropped_samples)
+
+
+def _ensure_worker():
+    global _worker
+    if _worker is not None:
+        return
+    with _worker_lock:
+        if _worker is None:
+            _worker = threading.Thread(target=_run, name="shadow-worker", daemon=True)
+            _worker.start()
+
+
+def _run():
+    while True:
+        item = _queue.get()
+        try:
+            _evaluate(*item)
+        except Exception as e:
+            print(f"SHADOW ERROR: {str(e)}")
+        finally:
+            _queue.task_done()
+
+
+def _evaluate(name, inputs, primary_predictions, primary_ms, logged_inputs):
+    predict, compare = _candidates[name]
+
+    start = time.perf_counter()
+    candidate_predictions = predict(inputs)
+    candidate_ms = (time.perf_counter() - start) * 1000
+
+    if logged_inputs is None:
+        logged_inputs = [list(map(float, row)) for row in inputs]
+    rows = []
+    for logged, primary, candidate in zip(
+        logged_inputs, primary_predictions, candidate_predictions
+    ):
+        agreement, delta = compare(primary, candidate)
+        rows.append(
+            ShadowComparison(
+                model_name=name,
+                input_data=json.dumps(logged),
+                primary_prediction=str(primary),
+                candidate_prediction=str(candidate),
+                agreement=bool(agreement),
+                delta=delta,
+                primary_latency_ms=primary_ms,
+                candidate_latency_ms=candidate_ms,
+                latency_ratio=candidate_ms / primary_ms if primary_ms else None,
+            )
+        )
+
+    with Session(engine) as session:
+        session.add_all(rows)
+        session.commit()